@@ -0,0 +1,258 @@
+"""
+Shared Playwright browser for the Stand Up Sydney FastMCP servers
+One headless Chromium is started on first use and kept for the life of the
+process; each tool call gets its own BrowserContext, which is far cheaper
+than a browser and isolates cookies and storage between calls
+
+The Playwright driver, and the browser with it, exits when the server
+process does, so nothing is closed explicitly
+"""
+
+import asyncio
+import collections
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from urllib.parse import urlsplit
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Page the tools open when the caller doesn't name one
+PLATFORM_URL = os.getenv("PLATFORM_URL", "https://standup-sydney.vercel.app")
+
+BROWSER_ARGS = ["--disable-dev-shm-usage"]
+
+# Warm contexts kept for the hot tools, and how often each is reused before
+# it is replaced so leaks in long-lived contexts can't build up
+CONTEXT_POOL_SIZE = os.cpu_count() or 4
+MAX_USES_PER_CONTEXT = 500
+
+# Signed-in browser state saved per platform role, reused until it is a day
+# old (about when the platform's session cookies expire)
+STORAGE_STATE_DIR = os.getenv("STORAGE_STATE_DIR", "/opt/standup-sydney-mcp/auth")
+STORAGE_STATE_MAX_AGE = 24 * 60 * 60
+ROLES = frozenset({"admin", "comedian", "venue"})
+
+# Screenshots kept for get_screenshot, bounded by count and total size
+SCREENSHOT_CACHE_SIZE = 64
+SCREENSHOT_CACHE_BYTES = 128 * 1024 * 1024
+
+_playwright = None
+_browser = None
+_browser_lock: Optional[asyncio.Lock] = None
+
+async def get_browser():
+    """The shared Chromium browser, launched on first use inside the running event loop"""
+    global _playwright, _browser, _browser_lock
+    if _browser is not None and _browser.is_connected():
+        return _browser
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            try:
+                if _playwright is None:
+                    from playwright.async_api import async_playwright
+                    _playwright = await async_playwright().start()
+                _browser = await _playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+            except Exception:
+                # The driver may be what died, so the next call starts both afresh
+                _browser = None
+                if _playwright is not None:
+                    with contextlib.suppress(Exception):
+                        await _playwright.stop()
+                    _playwright = None
+                raise
+            logger.info("Chromium %s launched", _browser.version)
+    return _browser
+
+@contextlib.asynccontextmanager
+async def new_page(**context_options: Any) -> AsyncIterator[Any]:
+    """A page in a fresh BrowserContext, closed with everything it opened on exit"""
+    browser = await get_browser()
+    context = await browser.new_context(**context_options)
+    try:
+        yield await context.new_page()
+    finally:
+        await context.close()
+
+def storage_state_file(role: str) -> str:
+    """Where the signed-in state for role is saved"""
+    if role not in ROLES:
+        raise ValueError(f"Unknown role: {role} (expected one of {', '.join(sorted(ROLES))})")
+    return os.path.join(STORAGE_STATE_DIR, f"{role}.json")
+
+def storage_state_for(role: str) -> Optional[str]:
+    """The saved signed-in state for role, or None if there is none or it has expired"""
+    path = storage_state_file(role)
+    try:
+        age = time.time() - os.stat(path).st_mtime
+    except OSError:
+        return None
+    if age > STORAGE_STATE_MAX_AGE:
+        logger.info("Signed-in state for %s is %.0fh old, ignoring it", role, age / 3600)
+        return None
+    return path
+
+def save_storage_state(role: str, state: Dict[str, Any]) -> str:
+    """Save the signed-in state for role, readable by the server's user only"""
+    path = storage_state_file(role)
+    os.makedirs(STORAGE_STATE_DIR, mode=0o700, exist_ok=True)
+    # mkstemp opens the file 0600 before anything is written, and the rename
+    # means a half-written state is never picked up by a test
+    fd, tmp = tempfile.mkstemp(dir=STORAGE_STATE_DIR, prefix=f".{role}.", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+    return path
+
+class _PooledContext:
+    __slots__ = ("context", "uses", "origins", "reusable")
+
+    def __init__(self, context: Any):
+        self.context = context
+        self.uses = 0
+        # Origins visited since the context was last wiped
+        self.origins: Set[str] = set()
+        self.reusable = True
+
+class ContextPool:
+    """
+    Bounded pool of warm BrowserContexts
+    
+    At most size contexts are checked out at once; callers beyond that wait for
+    one to be returned. Cookies and granted permissions are cleared on return
+    (pooled_page also wipes the site data of every origin visited), and a
+    context is closed rather than returned once it has been used max_uses
+    times, could not be wiped, or its browser has gone away.
+    """
+
+    def __init__(self, size: int, max_uses: int):
+        self.size = size
+        self.max_uses = max_uses
+        self._idle: List[_PooledContext] = []
+        self._in_use = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def acquire(self) -> _PooledContext:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                entry = self._idle.pop()
+                if entry.context.browser is not None and entry.context.browser.is_connected():
+                    break
+            else:
+                entry = _PooledContext(await (await get_browser()).new_context())
+        except BaseException:
+            self._slots.release()
+            raise
+        self._in_use += 1
+        return entry
+
+    async def release(self, entry: _PooledContext) -> None:
+        self._in_use -= 1
+        entry.uses += 1
+        try:
+            if entry.uses >= self.max_uses or not entry.reusable:
+                await entry.context.close()
+                return
+            await entry.context.clear_cookies()
+            await entry.context.clear_permissions()
+            self._idle.append(entry)
+        except Exception as e:
+            logger.warning("Dropping browser context: %s", e)
+            with contextlib.suppress(Exception):
+                await entry.context.close()
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": self.size, "idle": len(self._idle), "in_use": self._in_use, "max_uses": self.max_uses}
+
+context_pool = ContextPool(CONTEXT_POOL_SIZE, MAX_USES_PER_CONTEXT)
+
+def _note_origin(origins: Set[str], url: str) -> None:
+    parts = urlsplit(url)
+    if parts.scheme in ("http", "https") and parts.netloc:
+        origins.add(f"{parts.scheme}://{parts.netloc}")
+
+async def _wipe_site_data(entry: _PooledContext, page: Any) -> None:
+    """Clear every kind of storage of the origins entry has visited, and close any popups"""
+    for other in entry.context.pages:
+        for frame in other.frames:
+            _note_origin(entry.origins, frame.url)
+        if other is not page:
+            await other.close()
+    if not entry.origins:
+        return
+    # IndexedDB, CacheStorage, service workers and the rest are kept per origin
+    # by the context, so Chromium is asked to drop all of it for each one
+    session = await entry.context.new_cdp_session(page)
+    try:
+        await asyncio.gather(*(
+            session.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            for origin in entry.origins
+        ))
+    finally:
+        await session.detach()
+    entry.origins.clear()
+
+@contextlib.asynccontextmanager
+async def pooled_page() -> AsyncIterator[Any]:
+    """A page in a warm context from context_pool, cleaned up and returned on exit"""
+    entry = await context_pool.acquire()
+    try:
+        page = await entry.context.new_page()
+        # Redirects and iframes count too, they can leave storage of their own
+        page.on("framenavigated", lambda frame: _note_origin(entry.origins, frame.url))
+        try:
+            yield page
+        finally:
+            try:
+                await _wipe_site_data(entry, page)
+            except Exception as e:
+                logger.warning("Could not clear browser site data, retiring the context: %s", e)
+                entry.reusable = False
+            await page.close()
+    finally:
+        await context_pool.release(entry)
+
+class ScreenshotStore:
+    """Recent screenshots by reference, least recently used dropped first"""
+
+    def __init__(self, max_items: int, max_bytes: int):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._shots: "collections.OrderedDict[str, Tuple[bytes, str]]" = collections.OrderedDict()
+        self._bytes = 0
+
+    def put(self, data: bytes, image_format: str) -> str:
+        """Keep a screenshot and return its reference"""
+        ref = uuid.uuid4().hex
+        self._shots[ref] = (data, image_format)
+        self._bytes += len(data)
+        while len(self._shots) > self.max_items or (self._bytes > self.max_bytes and len(self._shots) > 1):
+            _, (dropped, _) = self._shots.popitem(last=False)
+            self._bytes -= len(dropped)
+        return ref
+
+    def get(self, ref: str) -> Optional[Tuple[bytes, str]]:
+        """The screenshot data and format for ref, if it is still kept"""
+        shot = self._shots.get(ref)
+        if shot is not None:
+            self._shots.move_to_end(ref)
+        return shot
+
+screenshots = ScreenshotStore(SCREENSHOT_CACHE_SIZE, SCREENSHOT_CACHE_BYTES)
@@ -0,0 +1,121 @@
+"""
+Shared API clients for the Stand Up Sydney FastMCP servers
+Each client is built on first use and reused by every tool call, so the
+TCP/TLS handshake and auth round-trip are paid once per process
+"""
+
+import functools
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from _runtime import now_iso
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+
+@functools.lru_cache(maxsize=1)
+def supabase_client(url: str, key: str):
+    """Supabase client for the Stand Up Sydney database"""
+    from supabase import create_client
+    return create_client(url, key)
+
+@functools.lru_cache(maxsize=1)
+def github_http_client(token: str):
+    """Keep-alive HTTP client for GitHub REST calls that can use conditional requests
+
+    Concurrent calls share one HTTP/2 connection when the h2 package is
+    installed. Must be first requested from inside the server's event loop.
+    """
+    import importlib.util
+    import httpx
+    return httpx.AsyncClient(
+        base_url=GITHUB_API_URL,
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28"
+        },
+        timeout=10.0
+    )
+
+# Last body and ETag seen for each GitHub path, oldest first
+_GITHUB_ETAGS: Dict[str, Tuple[str, Any]] = {}
+GITHUB_ETAG_CACHE_SIZE = 256
+
+async def github_get(client, path: str) -> Tuple[Any, bool]:
+    """
+    GET a GitHub API path, revalidating the cached body with If-None-Match
+    
+    Returns the decoded body and whether it came from the cache. A 304 costs a
+    small round-trip, no body or JSON decoding, and doesn't count against the
+    rate limit.
+    """
+    cached = _GITHUB_ETAGS.get(path)
+    headers = {"If-None-Match": cached[0]} if cached is not None else None
+    response = await client.get(path, headers=headers)
+    if response.status_code == 304 and cached is not None:
+        return cached[1], True
+
+    response.raise_for_status()
+    body = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        _GITHUB_ETAGS.pop(path, None)
+        if len(_GITHUB_ETAGS) >= GITHUB_ETAG_CACHE_SIZE:
+            del _GITHUB_ETAGS[next(iter(_GITHUB_ETAGS))]
+        _GITHUB_ETAGS[path] = (etag, body)
+    return body, False
+
+def build_supabase_query(client, table: str, operation: str, filters: Dict[str, Any] = None, data: Dict[str, Any] = None):
+    """Build a Supabase query for a tool call, ready to execute()"""
+    query = client.table(table)
+    if operation == "insert":
+        return query.insert(data or {})
+
+    if operation == "select":
+        query = query.select("*")
+    elif operation in ("update", "delete"):
+        # Never touch a whole table from a tool call
+        if not filters:
+            raise ValueError(f"{operation} on {table} requires filters")
+        query = query.update(data or {}) if operation == "update" else query.delete()
+    else:
+        raise ValueError(f"Unsupported operation: {operation}")
+
+    for column, value in (filters or {}).items():
+        query = query.eq(column, value)
+    return query
+
+# Response skeleton copied for each call, only the per-call fields are filled in.
+# Kept as a plain dict: copying it beats building a slotted dataclass, and
+# dicts serialize faster than dataclass instances
+_SUPABASE_TEMPLATE = {
+    "operation": None,
+    "table": None,
+    "filters": None,
+    "data": None,
+    "result": None,
+    "status": "success",
+    "message": None,
+    "timestamp": None
+}
+
+# Messages depend on a handful of (operation, table) pairs, so format each once
+@functools.lru_cache(maxsize=256)
+def _supabase_message(operation: str, table: str) -> str:
+    return f"FastMCP executed {operation} on {table} table"
+
+def supabase_result(table: str, operation: str, filters: Optional[Dict[str, Any]], data: Optional[Dict[str, Any]], result: Any) -> Dict[str, Any]:
+    """The tool response for a Supabase operation that returned result"""
+    response = _SUPABASE_TEMPLATE.copy()
+    response["operation"] = operation
+    response["table"] = table
+    response["filters"] = filters or {}
+    response["data"] = data or {}
+    response["result"] = result
+    response["message"] = _supabase_message(operation, table)
+    response["timestamp"] = now_iso()
+    return response
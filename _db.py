@@ -0,0 +1,280 @@
+"""
+Direct Postgres access for the Stand Up Sydney FastMCP servers
+Queries borrow connections from one asyncpg pool per process, so the
+TCP/TLS handshake and auth are paid once per connection rather than per
+tool call, and concurrent calls never open more than POOL_MAX_SIZE
+connections to Supabase
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Postgres connection string from the Supabase dashboard (Supavisor pooler)
+DB_URL = os.getenv("SUPABASE_DB_URL", "")
+DB_ENABLED = bool(DB_URL)
+
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 10
+
+# Every row of a batch is held in memory until it is sent, so cap its size
+MAX_BATCH_OPERATIONS = 1000
+
+# Scalar types bound and read as text, so Postgres casts JSON strings such as
+# "42" or "2026-10-15" the way the Supabase REST API does, where the binary
+# codecs would reject them. Numbers and booleans still come back as Python
+# values; dates and times come back as Postgres writes them (which also
+# covers infinity)
+_TEXT_CODECS = {
+    "int2": int,
+    "int4": int,
+    "int8": int,
+    "float4": float,
+    "float8": float,
+    "numeric": Decimal,
+    "bool": lambda value: value == "t",
+    "date": str,
+    "time": str,
+    "timestamp": str,
+    "timestamptz": str,
+    "uuid": str
+}
+
+async def _init_connection(conn) -> None:
+    for typename, decoder in _TEXT_CODECS.items():
+        await conn.set_type_codec(typename, schema="pg_catalog", encoder=str, decoder=decoder, format="text")
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+def quote_ident(name: str) -> str:
+    """Quote a table or column name, rejecting anything that isn't a plain identifier"""
+    if not _IDENTIFIER.fullmatch(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return f'"{name}"'
+
+def _where(columns: Tuple[str, ...], start: int) -> str:
+    return " AND ".join(f"{quote_ident(column)} = ${i}" for i, column in enumerate(columns, start))
+
+@functools.lru_cache(maxsize=512)
+def _query_sql(table: str, operation: str, filter_columns: Tuple[str, ...], data_columns: Tuple[str, ...]) -> str:
+    """
+    SQL for one query shape. Tool calls hit a handful of (table, operation,
+    columns) shapes over and over, so each is rendered and validated once.
+    """
+    target = quote_ident(table)
+
+    if operation == "insert":
+        if not data_columns:
+            return f"INSERT INTO {target} DEFAULT VALUES RETURNING *"
+        columns = ", ".join(quote_ident(column) for column in data_columns)
+        params = ", ".join(f"${i}" for i in range(1, len(data_columns) + 1))
+        return f"INSERT INTO {target} ({columns}) VALUES ({params}) RETURNING *"
+
+    if operation == "select":
+        if not filter_columns:
+            return f"SELECT * FROM {target}"
+        return f"SELECT * FROM {target} WHERE {_where(filter_columns, 1)}"
+
+    if operation not in ("update", "delete"):
+        raise ValueError(f"Unsupported operation: {operation}")
+    # Never touch a whole table from a tool call
+    if not filter_columns:
+        raise ValueError(f"{operation} on {table} requires filters")
+
+    if operation == "delete":
+        return f"DELETE FROM {target} WHERE {_where(filter_columns, 1)} RETURNING *"
+
+    if not data_columns:
+        raise ValueError(f"update on {table} requires data")
+    assignments = ", ".join(f"{quote_ident(column)} = ${i}" for i, column in enumerate(data_columns, 1))
+    return f"UPDATE {target} SET {assignments} WHERE {_where(filter_columns, len(data_columns) + 1)} RETURNING *"
+
+def build_query(table: str, operation: str, filters: Dict[str, Any] = None, data: Dict[str, Any] = None) -> Tuple[str, List[Any]]:
+    """Build parameterized SQL and its arguments for a tool call, same rules as build_supabase_query"""
+    filters = filters or {}
+    data = data or {}
+    if operation == "insert":
+        return _query_sql(table, operation, (), tuple(data)), list(data.values())
+    if operation in ("select", "delete"):
+        return _query_sql(table, operation, tuple(filters), ()), list(filters.values())
+    return _query_sql(table, operation, tuple(filters), tuple(data)), [*data.values(), *filters.values()]
+
+# Postgres caps the bind parameters of one statement
+MAX_QUERY_PARAMETERS = 32767
+
+@functools.lru_cache(maxsize=128)
+def _insert_rows_sql(table: str, columns: Tuple[str, ...], row_count: int) -> str:
+    """Multi-row INSERT for row_count rows of columns, returning every inserted row in order"""
+    width = len(columns)
+    values = ", ".join(
+        "(" + ", ".join(f"${row * width + i}" for i in range(1, width + 1)) + ")"
+        for row in range(row_count)
+    )
+    names = ", ".join(quote_ident(column) for column in columns)
+    return f"INSERT INTO {quote_ident(table)} ({names}) VALUES {values} RETURNING *"
+
+def _batch_groups(operations: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Split a batch into runs of operation indexes, in their original order.
+    Consecutive inserts into the same table with the same columns share a run
+    and go out as one multi-row INSERT, every other operation runs on its own.
+    """
+    groups: List[List[int]] = []
+    previous = None
+    for index, op in enumerate(operations):
+        shape = None
+        if op.get("operation") == "insert" and op.get("data"):
+            shape = (op.get("table"), frozenset(op["data"]))
+        if shape is not None and shape == previous:
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+        previous = shape
+    return groups
+
+@dataclass
+class AsyncDatabasePool:
+    """The process-wide asyncpg pool, with the counters reported by supabase_pool_stats"""
+    pool: Any = None
+    queries_executed: int = 0
+    errors: int = 0
+    last_health_ok: Optional[bool] = None
+    last_health_check: Optional[str] = None
+    _lock: Optional[asyncio.Lock] = field(default=None, repr=False)
+
+    async def get_pool(self):
+        """The asyncpg pool, created on first use inside the running event loop"""
+        if self.pool is not None:
+            return self.pool
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.pool is None:
+                import asyncpg
+                self.pool = await asyncpg.create_pool(
+                    dsn=DB_URL,
+                    min_size=POOL_MIN_SIZE,
+                    max_size=POOL_MAX_SIZE,
+                    max_inactive_connection_lifetime=300,
+                    command_timeout=60,
+                    # Supavisor/pgbouncer in transaction mode can't keep prepared statements
+                    statement_cache_size=0,
+                    init=_init_connection
+                )
+                logger.info("Postgres pool created (min=%d, max=%d)", POOL_MIN_SIZE, POOL_MAX_SIZE)
+        return self.pool
+
+    async def fetch(self, sql: str, *args: Any) -> List[Dict[str, Any]]:
+        """Run sql on a pooled connection and return its rows as dicts"""
+        self._count_queries(1)
+        # No retry: the pool already replaces closed connections on acquire, and
+        # re-running a write that failed mid-flight could apply it twice
+        try:
+            pool = await self.get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(sql, *args)
+        except Exception:
+            self.errors += 1
+            raise
+        return [dict(row) for row in rows]
+
+    async def run_batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run supabase_query-style operations in one transaction on one connection
+        
+        Each operation is a dict with table, operation, filters and data. Returns
+        one status per operation, in order, with the rows it returned, as
+        supabase_query would; if any operation fails the whole batch is rolled
+        back.
+        """
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise ValueError(f"Batch of {len(operations)} operations exceeds the limit of {MAX_BATCH_OPERATIONS}")
+
+        queries = [
+            build_query(op.get("table", ""), op.get("operation", "select"), op.get("filters"), op.get("data"))
+            for op in operations
+        ]
+        results: List[Dict[str, Any]] = [{"status": "rolled_back"} for _ in operations]
+        group: List[int] = []
+        try:
+            pool = await self.get_pool()
+            async with pool.acquire() as conn, conn.transaction():
+                for group in _batch_groups(operations):
+                    # Counted before it runs, like fetch(), so a failing group
+                    # shows up in both queries and errors
+                    self._count_queries(len(group))
+                    if len(group) > 1:
+                        # One statement for the whole run (or a few, for very
+                        # wide runs), each operation still gets its row back
+                        first = operations[group[0]]
+                        columns = tuple(first["data"])
+                        per_statement = MAX_QUERY_PARAMETERS // len(columns)
+                        for start in range(0, len(group), per_statement):
+                            chunk = group[start:start + per_statement]
+                            args = [operations[i]["data"][column] for i in chunk for column in columns]
+                            rows = await conn.fetch(_insert_rows_sql(first["table"], columns, len(chunk)), *args)
+                            for i, row in zip(chunk, rows):
+                                results[i] = {"status": "success", "result": [dict(row)]}
+                    else:
+                        sql, args = queries[group[0]]
+                        rows = await conn.fetch(sql, *args)
+                        results[group[0]] = {"status": "success", "result": [dict(row) for row in rows]}
+        except Exception as e:
+            logger.error("Postgres batch of %d operations rolled back: %s", len(operations), e)
+            # Blame the operations that were running, or all of them if the
+            # transaction never started
+            failed = set(group) if group else set(range(len(operations)))
+            if not group:
+                self._count_queries(len(failed))
+            self.errors += len(failed)
+            for i in range(len(results)):
+                results[i] = {"status": "error", "error": str(e)} if i in failed else {"status": "rolled_back"}
+        return results
+
+    def _count_queries(self, count: int) -> None:
+        before = self.queries_executed
+        self.queries_executed += count
+        if self.queries_executed // 1000 != before // 1000:
+            logger.info("Postgres pool: %d queries, %d errors", self.queries_executed, self.errors)
+
+    async def health_check(self, timeout: float = 2.0) -> bool:
+        """Run SELECT 1 on a pooled connection, recording whether it succeeded"""
+        try:
+            # The timeout also covers creating the pool if this is its first use
+            await asyncio.wait_for(self._select_one(), timeout)
+            self.last_health_ok = True
+        except Exception as e:
+            logger.warning("Postgres health check failed: %s", e)
+            self.last_health_ok = False
+        self.last_health_check = datetime.now().isoformat()
+        return self.last_health_ok
+
+    async def _select_one(self) -> None:
+        pool = await self.get_pool()
+        async with pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size and query counters, without touching the database"""
+        pool = self.pool
+        return {
+            "size": pool.get_size() if pool is not None else 0,
+            "idle": pool.get_idle_size() if pool is not None else 0,
+            "min": POOL_MIN_SIZE,
+            "max": POOL_MAX_SIZE,
+            "queries": self.queries_executed,
+            "errors": self.errors,
+            "success_rate": 1 - self.errors / self.queries_executed if self.queries_executed else 1.0,
+            "last_health_ok": self.last_health_ok,
+            "last_health_check": self.last_health_check
+        }
+
+database = AsyncDatabasePool()
@@ -0,0 +1,195 @@
+"""
+Process-level runtime setup for the Stand Up Sydney FastMCP servers, and the
+clock and payload caches both servers' tools share
+"""
+
+import asyncio
+import atexit
+import functools
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Directory for the pid file when systemd doesn't provide one: both service
+# units set RuntimeDirectory=standup-sydney-mcp, which is this path
+_DEFAULT_RUNTIME_DIR = "/run/standup-sydney-mcp"
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Private logger that owns the real log handlers, driven by the queue listener
+_LOG_SINK = "standup_sydney_mcp.sink"
+
+# Records waiting for the listener; past this, new records are dropped rather
+# than blocking the tool call that logged them
+LOG_QUEUE_SIZE = 10_000
+_log_records_dropped = 0
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _log_records_dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _log_records_dropped += 1
+
+class _LogListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at exit, wait for the listener to make room
+        self.queue.put(self._sentinel)
+
+def log_records_dropped() -> int:
+    """Log records dropped because the log queue was full"""
+    return _log_records_dropped
+
+def _can_write(path: str) -> bool:
+    if os.path.exists(path):
+        return os.access(path, os.W_OK)
+    return os.access(os.path.dirname(path) or ".", os.W_OK)
+
+def configure_logging(log_file: str) -> bool:
+    """
+    Configure logging once for the whole process
+    
+    Callers only enqueue records; a listener thread writes them to the console
+    and, when it is writable, a rotating log_file. Returns whether file
+    logging is enabled.
+    """
+    log_to_file = _can_write(log_file)
+    sink_handlers = {"console": {"class": "logging.StreamHandler", "formatter": "default"}}
+    if log_to_file:
+        sink_handlers["file"] = {
+            "class": "logging.handlers.RotatingFileHandler",
+            "formatter": "default",
+            "filename": log_file,
+            "maxBytes": 10_485_760,
+            "backupCount": 5
+        }
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    logging.config.dictConfig({
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {"default": {"format": LOG_FORMAT}},
+        "handlers": {
+            **sink_handlers,
+            "queue": {"()": _DroppingQueueHandler, "queue": log_queue}
+        },
+        "loggers": {_LOG_SINK: {"handlers": list(sink_handlers), "propagate": False}},
+        "root": {"level": os.getenv("LOG_LEVEL", "INFO"), "handlers": ["queue"]}
+    })
+
+    listener = _LogListener(
+        log_queue, *logging.getLogger(_LOG_SINK).handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return log_to_file
+
+def install_uvloop() -> bool:
+    """Run the server's event loop on uvloop when it is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+def pid_file_path() -> str:
+    """
+    The lock file shared by server.py and server_fixed.py, so only one of them
+    runs at a time
+    
+    PID_FILE overrides it, and an empty PID_FILE allows several instances.
+    Read on each call, so a value from .env is seen once it has been loaded.
+    """
+    path = os.getenv("PID_FILE")
+    if path is not None:
+        return path
+    runtime_dir = os.getenv("RUNTIME_DIRECTORY", _DEFAULT_RUNTIME_DIR).split(":")[0]
+    return os.path.join(runtime_dir, "standup-sydney-mcp.pid")
+
+def acquire_single_instance_lock(path: Optional[str] = None) -> bool:
+    """
+    Lock the pid file (pid_file_path() unless path is given) for the lifetime
+    of the process
+    
+    Returns False if another server process already holds the lock. If the
+    pid file can't be opened the check is skipped and True is returned.
+    """
+    if path is None:
+        path = pid_file_path()
+    if not path or fcntl is None:
+        return True
+
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError as e:
+        logger.warning("Cannot open pid file %s, skipping single-instance check: %s", path, e)
+        return True
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+
+    os.ftruncate(fd, 0)
+    os.write(fd, str(os.getpid()).encode())
+    # The descriptor stays open (and locked) until the process exits
+    atexit.register(_release_pid_file, path, fd)
+    return True
+
+def _release_pid_file(path: str, fd: int) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+    os.close(fd)
+
+# Formatted timestamp shared by every tool response within the same 100ms. The
+# window runs on the monotonic clock, so a wall-clock step back (an NTP
+# correction) can't pin the old timestamp until the clock catches up
+_ts_cache = [float("-inf"), ""]
+
+def now_iso(resolution: float = 0.1) -> str:
+    """Current local time in ISO format, reformatted at most once per resolution seconds"""
+    now = time.monotonic()
+    if now - _ts_cache[0] >= resolution:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.now().isoformat()
+    return _ts_cache[1]
+
+# Cache for tool payloads that only change with the clock, keyed by tool name
+_TOOL_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+STATUS_CACHE_TTL = 5.0
+
+def cached(key: str, ttl: float, builder: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the cached payload for a tool, rebuilding it once it is older than ttl seconds"""
+    now = time.monotonic()
+    entry = _TOOL_CACHE.get(key)
+    if entry is not None and now - entry[0] < ttl:
+        return entry[1]
+    payload = builder()
+    _TOOL_CACHE[key] = (now, payload)
+    return payload
+
+def _build_health(base: Mapping[str, Any]) -> Dict[str, Any]:
+    return {**base, "timestamp": now_iso(), "log_records_dropped": log_records_dropped()}
+
+def health_response(base: Mapping[str, Any]) -> Dict[str, Any]:
+    """The health_check payload: base plus the time and log counters, rebuilt every STATUS_CACHE_TTL seconds"""
+    # Keyed by base as well, so servers sharing this module never share a payload
+    return cached(f"health_check:{id(base)}", STATUS_CACHE_TTL, functools.partial(_build_health, base))
@@ -0,0 +1,131 @@
+"""
+Shared configuration for the Stand Up Sydney FastMCP servers
+Read from the environment once, the first time a server imports it
+"""
+
+import os
+import types
+import functools
+from datetime import datetime
+from typing import Any, Dict, Mapping, Tuple
+
+# API integrations, configured the same way for every server
+_INTEGRATION_CONFIGS = {
+    "supabase": {
+        "url": os.getenv("SUPABASE_URL", ""),
+        "key": os.getenv("SUPABASE_ANON_KEY", ""),
+        "enabled": bool(os.getenv("SUPABASE_URL")),
+        "description": "Backend API operations for Stand Up Sydney database"
+    },
+    "github": {
+        "token": os.getenv("GITHUB_TOKEN", ""),
+        "enabled": bool(os.getenv("GITHUB_TOKEN")),
+        "description": "Version control and deployment tracking"
+    },
+    "notion": {
+        "token": os.getenv("NOTION_TOKEN", ""),
+        "enabled": bool(os.getenv("NOTION_TOKEN")),
+        "description": "Project logging, tasks, and documentation"
+    },
+    "metricool": {
+        "api_key": os.getenv("METRICOOL_API_KEY", ""),
+        "enabled": bool(os.getenv("METRICOOL_API_KEY")),
+        "description": "Social media promotion and analytics"
+    }
+}
+
+# Hot-path guards for the tool handlers
+SUPABASE_ENABLED = _INTEGRATION_CONFIGS["supabase"]["enabled"]
+GITHUB_ENABLED = _INTEGRATION_CONFIGS["github"]["enabled"]
+NOTION_ENABLED = _INTEGRATION_CONFIGS["notion"]["enabled"]
+METRICOOL_ENABLED = _INTEGRATION_CONFIGS["metricool"]["enabled"]
+
+# Credentials the tool handlers pass to the shared clients on every call
+SUPABASE_URL = _INTEGRATION_CONFIGS["supabase"]["url"]
+SUPABASE_KEY = _INTEGRATION_CONFIGS["supabase"]["key"]
+GITHUB_TOKEN = _INTEGRATION_CONFIGS["github"]["token"]
+
+# Error responses for tools whose credentials are missing
+SUPABASE_DISABLED = types.MappingProxyType({"error": "Supabase tool not enabled - check SUPABASE_URL and SUPABASE_ANON_KEY"})
+GITHUB_DISABLED = types.MappingProxyType({"error": "GitHub tool not enabled - check GITHUB_TOKEN"})
+NOTION_DISABLED = types.MappingProxyType({"error": "Notion tool not enabled - check NOTION_TOKEN"})
+METRICOOL_DISABLED = types.MappingProxyType({"error": "Metricool tool not enabled - check METRICOOL_API_KEY"})
+
+# Web automation tool, listed under a different name by each server
+_AUTOMATION_CONFIGS = {
+    "browser": {
+        "enabled": True,
+        "description": "Web automation for data scraping and testing"
+    },
+    "playwright": {
+        "enabled": True,
+        "description": "Playwright browser automation for testing and web scraping"
+    }
+}
+
+_FILESYSTEM_CONFIG = {
+    "enabled": True,
+    "description": "File operations for content management"
+}
+
+@functools.lru_cache(maxsize=None)
+def make_tool_configs(automation: str) -> Dict[str, Dict[str, Any]]:
+    """Tool configurations for a server whose web automation tool is named automation"""
+    return {
+        **_INTEGRATION_CONFIGS,
+        automation: _AUTOMATION_CONFIGS[automation],
+        "filesystem": _FILESYSTEM_CONFIG
+    }
+
+@functools.lru_cache(maxsize=None)
+def enabled_tool_names(automation: str) -> Tuple[str, ...]:
+    """Names of the enabled tools in make_tool_configs(automation)"""
+    return tuple(name for name, config in make_tool_configs(automation).items() if config["enabled"])
+
+@functools.lru_cache(maxsize=None)
+def make_tools_status(automation: str) -> Mapping[str, Mapping[str, Any]]:
+    """Read-only status of every tool in make_tool_configs(automation)"""
+    return types.MappingProxyType({
+        name: types.MappingProxyType({
+            "enabled": config["enabled"],
+            "description": config["description"],
+            "configured": bool(config.get("token") or config.get("api_key") or config.get("url") or config["enabled"])
+        })
+        for name, config in make_tool_configs(automation).items()
+    })
+
+def make_server_config(version: str, host: str) -> Mapping[str, Any]:
+    """Read-only server configuration, stamped with the time it was created"""
+    return types.MappingProxyType({
+        "name": "Stand Up Sydney FastMCP",
+        "version": version,
+        "host": host,
+        "port": 8080,
+        "deployed_at": datetime.now().isoformat(),
+        "platform": "comedy_booking_automation"
+    })
+
+def make_health_base(automation: str, server_config: Mapping[str, Any], **extra: Any) -> Dict[str, Any]:
+    """Everything in a health_check response except its timestamp and log counters"""
+    enabled = enabled_tool_names(automation)
+    return {
+        "status": "healthy",
+        "server": dict(server_config),
+        "tools_enabled": list(enabled),
+        "tools_count": len(enabled),
+        "deployment": f"droplet_{server_config['host']}",
+        **extra
+    }
+
+def make_tools_list(automation: str, server_config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    The list_tools response, which never changes once the environment has been
+    read. The read-only views are copied into plain dicts so they can be
+    serialized
+    """
+    return {
+        "tools": {name: dict(status) for name, status in make_tools_status(automation).items()},
+        "total_tools": len(make_tool_configs(automation)),
+        "enabled_tools": len(enabled_tool_names(automation)),
+        "server_config": dict(server_config)
+    }
@@ -117,6 +117,8 @@ Group=$APP_USER
 WorkingDirectory=$APP_DIR
 Environment=PATH=$APP_DIR/venv/bin
 EnvironmentFile=$APP_DIR/.env
+# /run/standup-sydney-mcp, writable by the service user, holds the pid file
+RuntimeDirectory=standup-sydney-mcp
 ExecStart=$APP_DIR/venv/bin/python server.py
 Restart=always
 RestartSec=10
@@ -14,10 +14,12 @@ USER="root"
 echo "📁 Creating directory structure..."
 mkdir -p "$MCP_DIR/logs"
 mkdir -p "$MCP_DIR/backups"
+mkdir -p "$MCP_DIR/auth"
 
 # Copy files
 echo "📋 Copying server files..."
 cp server_fixed.py "$MCP_DIR/server.py"
+cp _browser.py _clients.py _db.py _runtime.py config.py "$MCP_DIR/"
 cp requirements.txt "$MCP_DIR/"
 
 # Create .env template if it doesn't exist
@@ -30,10 +32,14 @@ if [ ! -f "$MCP_DIR/.env" ]; then
 # Server Configuration
 HOST=0.0.0.0
 PORT=8080
+# stdio, or sse/http to serve clients over TCP on HOST:PORT
+MCP_TRANSPORT=stdio
 
 # Supabase Configuration
 SUPABASE_URL=your_supabase_url_here
 SUPABASE_ANON_KEY=your_supabase_anon_key_here
+# Direct Postgres connection (Supavisor pooler URL), used instead of the REST API when set
+SUPABASE_DB_URL=
 
 # GitHub Integration (Optional)
 GITHUB_TOKEN=your_github_token_here
@@ -80,11 +86,15 @@ pip install python-dotenv>=1.0.0
 pip install uvicorn>=0.24.0
 pip install pydantic>=2.0.0
 pip install requests>=2.31.0
+pip install "httpx[http2]>=0.25.0"
+pip install uvloop>=0.19.0 || echo "⚠️ uvloop failed to install, using the default asyncio loop"
 
 # Optional dependencies (install if API keys are available)
 pip install supabase>=2.0.0 || echo "⚠️ Supabase client failed to install"
+pip install asyncpg>=0.29.0 || echo "⚠️ asyncpg failed to install"
 pip install pygithub>=2.0.0 || echo "⚠️ PyGithub failed to install"
 pip install notion-client>=2.0.0 || echo "⚠️ Notion client failed to install"
+pip install playwright>=1.40.0 && PLAYWRIGHT_BROWSERS_PATH="$MCP_DIR/browsers" python -m playwright install --with-deps chromium || echo "⚠️ Playwright/Chromium failed to install"
 
 echo "✅ Dependencies installed"
 
@@ -116,6 +126,10 @@ User=$USER
 Group=$USER
 WorkingDirectory=$MCP_DIR
 Environment=PATH=$MCP_DIR/venv/bin
+# ProtectHome hides ~/.cache, so Chromium is installed under the app directory
+Environment=PLAYWRIGHT_BROWSERS_PATH=$MCP_DIR/browsers
+# /run/standup-sydney-mcp, writable by the service user, holds the pid file
+RuntimeDirectory=standup-sydney-mcp
 ExecStart=$MCP_DIR/venv/bin/python server.py
 Restart=always
 RestartSec=10
@@ -143,6 +157,7 @@ echo "🔒 Setting permissions..."
 chown -R $USER:$USER "$MCP_DIR"
 chmod +x "$MCP_DIR/server.py"
 chmod 600 "$MCP_DIR/.env"
+chmod 700 "$MCP_DIR/auth"
 
 # Reload systemd and enable service
 echo "🔄 Configuring systemd service..."
@@ -8,108 +8,54 @@ NOT as a DigitalOcean App - see DEPLOYMENT.md for details
 """
 
 import os
-import json
+import sys
+import functools
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, List, Set, Tuple
 from fastmcp import FastMCP
-from datetime import datetime
+from _clients import build_supabase_query, supabase_client, supabase_result
+from _runtime import acquire_single_instance_lock, configure_logging, health_response, install_uvloop, now_iso, pid_file_path
+from config import (
+    GITHUB_DISABLED, GITHUB_ENABLED, METRICOOL_DISABLED, METRICOOL_ENABLED, NOTION_DISABLED, NOTION_ENABLED,
+    SUPABASE_DISABLED, SUPABASE_ENABLED, SUPABASE_KEY, SUPABASE_URL,
+    enabled_tool_names, make_health_base, make_server_config, make_tool_configs, make_tools_list
+)
 import asyncio
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/var/log/standup-sydney-fastmcp.log'),
-        logging.StreamHandler()
-    ]
-)
+configure_logging('/var/log/standup-sydney-fastmcp.log')
 logger = logging.getLogger(__name__)
 
 # Initialize FastMCP server
 app = FastMCP("Stand Up Sydney MCP Server")
 
-# Server configuration
-SERVER_CONFIG = {
-    "name": "Stand Up Sydney FastMCP",
-    "version": "1.0.0",
-    "host": "170.64.252.55",
-    "port": 8080,
-    "deployed_at": datetime.now().isoformat(),
-    "platform": "comedy_booking_automation"
-}
+# Server configuration (read-only, it is shared by every status response)
+SERVER_CONFIG = make_server_config(version="1.0.0", host="170.64.252.55")
 
 # Tool configurations for Stand Up Sydney platform
-TOOL_CONFIGS = {
-    "supabase": {
-        "url": os.getenv("SUPABASE_URL", ""),
-        "key": os.getenv("SUPABASE_ANON_KEY", ""),
-        "enabled": bool(os.getenv("SUPABASE_URL")),
-        "description": "Backend API operations for Stand Up Sydney database"
-    },
-    "github": {
-        "token": os.getenv("GITHUB_TOKEN", ""),
-        "enabled": bool(os.getenv("GITHUB_TOKEN")),
-        "description": "Version control and deployment tracking"
-    },
-    "notion": {
-        "token": os.getenv("NOTION_TOKEN", ""),
-        "enabled": bool(os.getenv("NOTION_TOKEN")),
-        "description": "Project logging, tasks, and documentation"
-    },
-    "metricool": {
-        "api_key": os.getenv("METRICOOL_API_KEY", ""),
-        "enabled": bool(os.getenv("METRICOOL_API_KEY")),
-        "description": "Social media promotion and analytics"
-    },
-    "browser": {
-        "enabled": True,
-        "description": "Web automation for data scraping and testing"
-    },
-    "filesystem": {
-        "enabled": True,
-        "description": "File operations for content management"
-    }
-}
+TOOL_CONFIGS = make_tool_configs("browser")
+
+# Views derived from TOOL_CONFIGS, which is fixed once the environment has been read
+_ENABLED_TOOLS = enabled_tool_names("browser")
+_HEALTH_BASE = make_health_base("browser", SERVER_CONFIG)
+_TOOLS_LIST = make_tools_list("browser", SERVER_CONFIG)
 
 @app.tool()
 def health_check() -> Dict[str, Any]:
     """Health check endpoint for the FastMCP server"""
-    enabled_tools = [name for name, config in TOOL_CONFIGS.items() if config["enabled"]]
-    
-    return {
-        "status": "healthy",
-        "server": SERVER_CONFIG,
-        "tools_enabled": enabled_tools,
-        "tools_count": len(enabled_tools),
-        "timestamp": datetime.now().isoformat(),
-        "deployment": "droplet_170.64.252.55"
-    }
+    return health_response(_HEALTH_BASE)
 
 @app.tool()
 def list_tools() -> Dict[str, Any]:
     """List all available MCP tools and their status"""
-    tools_status = {}
-    for name, config in TOOL_CONFIGS.items():
-        tools_status[name] = {
-            "enabled": config["enabled"],
-            "description": config["description"],
-            "configured": bool(config.get("token") or config.get("api_key") or config.get("url") or config["enabled"])
-        }
-    
-    return {
-        "tools": tools_status,
-        "total_tools": len(TOOL_CONFIGS),
-        "enabled_tools": len([c for c in TOOL_CONFIGS.values() if c["enabled"]]),
-        "server_config": SERVER_CONFIG
-    }
+    return _TOOLS_LIST
 
 # ============================================================================
 # SUPABASE MCP TOOLS
 # ============================================================================
 
 @app.tool()
-def supabase_query(table: str, operation: str = "select", filters: Dict[str, Any] = None, data: Dict[str, Any] = None) -> Dict[str, Any]:
+async def supabase_query(table: str, operation: str = "select", filters: Dict[str, Any] = None, data: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Execute Supabase database operations for Stand Up Sydney platform
     
@@ -119,24 +65,87 @@ def supabase_query(table: str, operation: str = "select", filters: Dict[str, Any
         filters: Query filters for select/update/delete
         data: Data for insert/update operations
     """
-    if not TOOL_CONFIGS["supabase"]["enabled"]:
-        return {"error": "Supabase tool not enabled - check SUPABASE_URL and SUPABASE_ANON_KEY"}
+    if not SUPABASE_ENABLED:
+        return dict(SUPABASE_DISABLED)
     
-    # This would integrate with actual Supabase client
-    logger.info(f"Supabase operation: {operation} on {table}")
+    logger.info("Supabase operation: %s on %s", operation, table)
     
-    return {
-        "operation": operation,
-        "table": table,
-        "filters": filters or {},
-        "data": data or {},
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to execute {operation} on {table} table",
-        "timestamp": datetime.now().isoformat()
-    }
+    try:
+        query = build_supabase_query(supabase_client(SUPABASE_URL, SUPABASE_KEY), table, operation, filters, data)
+        # The Supabase SDK is synchronous, keep it off the event loop
+        response = await asyncio.to_thread(query.execute)
+    except Exception as e:
+        logger.error("Supabase %s on %s failed: %s", operation, table, e)
+        return {"error": f"Supabase {operation} on {table} failed: {e}"}
+    
+    return supabase_result(table, operation, filters, data, response.data)
+
+class _BatchingSupabase:
+    """
+    Coalesces concurrent select-by-id lookups into one `in_` query per table
+    
+    The first lookup for a (table, column) pair opens a window of window_ms;
+    every lookup arriving before it closes, or until max_batch distinct ids
+    are pending, shares a single round-trip.
+    """
+    
+    def __init__(self, window_ms: float = 5, max_batch: int = 64):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.pending: Dict[Tuple[str, str], Dict[str, List[asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self._flushes: Set[asyncio.Task] = set()
+    
+    async def select_by_id(self, table: str, row_id: Any, column: str = "id") -> List[Dict[str, Any]]:
+        """Return the rows of table whose column equals row_id"""
+        loop = asyncio.get_running_loop()
+        key = (table, column)
+        future = loop.create_future()
+        batch = self.pending.setdefault(key, {})
+        batch.setdefault(str(row_id), []).append(future)
+        
+        if len(batch) >= self.max_batch:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        return await future
+    
+    def _flush(self, key: Tuple[str, str]) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self.pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._execute(key, batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+    
+    async def _execute(self, key: Tuple[str, str], batch: Dict[str, List[asyncio.Future]]) -> None:
+        table, column = key
+        try:
+            query = supabase_client(SUPABASE_URL, SUPABASE_KEY).table(table).select("*").in_(column, list(batch))
+            response = await asyncio.to_thread(query.execute)
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        
+        rows_by_id: Dict[str, List[Dict[str, Any]]] = {}
+        for row in response.data:
+            rows_by_id.setdefault(str(row.get(column)), []).append(row)
+        for row_id, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(rows_by_id.get(row_id, []))
+
+SUPABASE_BATCH_WINDOW_MS = 5
+SUPABASE_MAX_BATCH = 64
+_supabase_batcher = _BatchingSupabase(window_ms=SUPABASE_BATCH_WINDOW_MS, max_batch=SUPABASE_MAX_BATCH)
 
 @app.tool()
-def supabase_comedian_operations(action: str, comedian_data: Dict[str, Any] = None, comedian_id: str = None) -> Dict[str, Any]:
+async def supabase_comedian_operations(action: str, comedian_data: Dict[str, Any] = None, comedian_id: str = None) -> Dict[str, Any]:
     """
     Comedian-specific Supabase operations for Stand Up Sydney
     
@@ -145,7 +154,20 @@ def supabase_comedian_operations(action: str, comedian_data: Dict[str, Any] = No
         comedian_data: Comedian information for create/update
         comedian_id: Comedian ID for get/update operations
     """
-    return supabase_query(
+    if action == "get" and comedian_id:
+        # Single-comedian lookups are batched with any others in flight
+        if not SUPABASE_ENABLED:
+            return dict(SUPABASE_DISABLED)
+        
+        logger.info("Supabase operation: %s on %s", "select", "comedians")
+        try:
+            rows = await _supabase_batcher.select_by_id("comedians", comedian_id)
+        except Exception as e:
+            logger.error("Supabase select on comedians failed: %s", e)
+            return {"error": f"Supabase select on comedians failed: {e}"}
+        return supabase_result("comedians", "select", {"id": comedian_id}, comedian_data, rows)
+    
+    return await supabase_query(
         table="comedians",
         operation="select" if action in ["get", "list"] else "insert" if action == "create" else "update",
         filters={"id": comedian_id} if comedian_id else None,
@@ -156,8 +178,20 @@ def supabase_comedian_operations(action: str, comedian_data: Dict[str, Any] = No
 # GITHUB MCP TOOLS  
 # ============================================================================
 
+_GITHUB_TEMPLATE = {
+    "repo": None,
+    "action": None,
+    "status": "ready_for_implementation",
+    "message": None,
+    "timestamp": None
+}
+
+@functools.lru_cache(maxsize=256)
+def _github_message(repo: str) -> str:
+    return f"FastMCP ready to track {repo} deployments"
+
 @app.tool()
-def github_deployment_tracking(repo: str, action: str = "status", deployment_data: Dict[str, Any] = None) -> Dict[str, Any]:
+async def github_deployment_tracking(repo: str, action: str = "status", deployment_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Track GitHub deployments for Stand Up Sydney platform
     
@@ -166,21 +200,20 @@ def github_deployment_tracking(repo: str, action: str = "status", deployment_dat
         action: Action type (status, create, list)
         deployment_data: Deployment information for creation
     """
-    if not TOOL_CONFIGS["github"]["enabled"]:
-        return {"error": "GitHub tool not enabled - check GITHUB_TOKEN"}
+    if not GITHUB_ENABLED:
+        return dict(GITHUB_DISABLED)
     
-    logger.info(f"GitHub deployment tracking: {action} for {repo}")
+    logger.info("GitHub deployment tracking: %s for %s", action, repo)
     
-    return {
-        "repo": repo,
-        "action": action,
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to track {repo} deployments",
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _GITHUB_TEMPLATE.copy()
+    response["repo"] = repo
+    response["action"] = action
+    response["message"] = _github_message(repo)
+    response["timestamp"] = now_iso()
+    return response
 
 @app.tool()
-def github_version_control(repo: str, operation: str, branch: str = "main", file_data: Dict[str, Any] = None) -> Dict[str, Any]:
+async def github_version_control(repo: str, operation: str, branch: str = "main", file_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     GitHub version control operations for Stand Up Sydney
     
@@ -190,14 +223,27 @@ def github_version_control(repo: str, operation: str, branch: str = "main", file
         branch: Git branch
         file_data: File information for create/update operations
     """
-    return github_deployment_tracking(repo, operation, {"branch": branch, "file_data": file_data})
+    return await github_deployment_tracking(repo, operation, {"branch": branch, "file_data": file_data})
 
 # ============================================================================
 # NOTION MCP TOOLS
 # ============================================================================
 
+_NOTION_TEMPLATE = {
+    "page_type": None,
+    "action": None,
+    "content": None,
+    "status": "ready_for_implementation",
+    "message": None,
+    "timestamp": None
+}
+
+@functools.lru_cache(maxsize=256)
+def _notion_message(action: str, page_type: str) -> str:
+    return f"FastMCP ready to {action} {page_type} in Notion"
+
 @app.tool()
-def notion_project_logging(page_type: str, action: str = "create", content: Dict[str, Any] = None) -> Dict[str, Any]:
+async def notion_project_logging(page_type: str, action: str = "create", content: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Notion project logging for Stand Up Sydney platform
     
@@ -206,22 +252,21 @@ def notion_project_logging(page_type: str, action: str = "create", content: Dict
         action: Action type (create, update, get, list)
         content: Page content for create/update operations
     """
-    if not TOOL_CONFIGS["notion"]["enabled"]:
-        return {"error": "Notion tool not enabled - check NOTION_TOKEN"}
+    if not NOTION_ENABLED:
+        return dict(NOTION_DISABLED)
     
-    logger.info(f"Notion project logging: {action} {page_type}")
+    logger.info("Notion project logging: %s %s", action, page_type)
     
-    return {
-        "page_type": page_type,
-        "action": action,
-        "content": content or {},
-        "status": "ready_for_implementation", 
-        "message": f"FastMCP ready to {action} {page_type} in Notion",
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _NOTION_TEMPLATE.copy()
+    response["page_type"] = page_type
+    response["action"] = action
+    response["content"] = content or {}
+    response["message"] = _notion_message(action, page_type)
+    response["timestamp"] = now_iso()
+    return response
 
 @app.tool()
-def notion_comedian_onboarding(comedian_data: Dict[str, Any], stage: str = "initial") -> Dict[str, Any]:
+async def notion_comedian_onboarding(comedian_data: Dict[str, Any], stage: str = "initial") -> Dict[str, Any]:
     """
     Notion-based comedian onboarding workflow
     
@@ -229,7 +274,7 @@ def notion_comedian_onboarding(comedian_data: Dict[str, Any], stage: str = "init
         comedian_data: Comedian information and requirements
         stage: Onboarding stage (initial, documentation, approval, complete)
     """
-    return notion_project_logging(
+    return await notion_project_logging(
         page_type="comedian_profile",
         action="create",
         content={"comedian_data": comedian_data, "onboarding_stage": stage}
@@ -239,8 +284,21 @@ def notion_comedian_onboarding(comedian_data: Dict[str, Any], stage: str = "init
 # METRICOOL MCP TOOLS
 # ============================================================================
 
+_METRICOOL_TEMPLATE = {
+    "campaign_type": None,
+    "content_data": None,
+    "schedule": None,
+    "status": "ready_for_implementation",
+    "message": None,
+    "timestamp": None
+}
+
+@functools.lru_cache(maxsize=256)
+def _metricool_message(campaign_type: str) -> str:
+    return f"FastMCP ready to create {campaign_type} promotion"
+
 @app.tool()
-def metricool_promotion(campaign_type: str, content_data: Dict[str, Any], schedule: Dict[str, Any] = None) -> Dict[str, Any]:
+async def metricool_promotion(campaign_type: str, content_data: Dict[str, Any], schedule: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Metricool social media promotion for Stand Up Sydney events
     
@@ -249,26 +307,32 @@ def metricool_promotion(campaign_type: str, content_data: Dict[str, Any], schedu
         content_data: Content information (text, images, hashtags)
         schedule: Posting schedule information
     """
-    if not TOOL_CONFIGS["metricool"]["enabled"]:
-        return {"error": "Metricool tool not enabled - check METRICOOL_API_KEY"}
+    if not METRICOOL_ENABLED:
+        return dict(METRICOOL_DISABLED)
     
-    logger.info(f"Metricool promotion: {campaign_type}")
+    logger.info("Metricool promotion: %s", campaign_type)
     
-    return {
-        "campaign_type": campaign_type,
-        "content_data": content_data,
-        "schedule": schedule or {},
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to create {campaign_type} promotion",
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _METRICOOL_TEMPLATE.copy()
+    response["campaign_type"] = campaign_type
+    response["content_data"] = content_data
+    response["schedule"] = schedule or {}
+    response["message"] = _metricool_message(campaign_type)
+    response["timestamp"] = now_iso()
+    return response
 
 # ============================================================================
 # AUTOMATION WORKFLOWS
 # ============================================================================
 
+# Caps the number of API calls workflows have in flight at once
+_WORKFLOW_API_LIMIT = asyncio.Semaphore(8)
+
+async def _throttled(call: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    async with _WORKFLOW_API_LIMIT:
+        return await call
+
 @app.tool()
-def comedian_booking_workflow(comedian_id: str, event_id: str, workflow_stage: str = "initial") -> Dict[str, Any]:
+async def comedian_booking_workflow(comedian_id: str, event_id: str, workflow_stage: str = "initial") -> Dict[str, Any]:
     """
     Complete comedian booking workflow automation
     
@@ -277,26 +341,28 @@ def comedian_booking_workflow(comedian_id: str, event_id: str, workflow_stage: s
         event_id: Event identifier  
         workflow_stage: Current workflow stage (initial, confirmed, promoted, completed)
     """
-    workflow_steps = []
-    
-    # Step 1: Check comedian availability (Supabase)
-    availability_check = supabase_comedian_operations("get", comedian_id=comedian_id)
-    workflow_steps.append({"step": "availability_check", "result": availability_check})
-    
-    # Step 2: Log booking in Notion
-    booking_log = notion_project_logging("booking_record", "create", {
-        "comedian_id": comedian_id,
-        "event_id": event_id,
-        "stage": workflow_stage
-    })
-    workflow_steps.append({"step": "notion_logging", "result": booking_log})
-    
-    # Step 3: Create promotion campaign (Metricool)
-    promotion = metricool_promotion("comedian_spotlight", {
-        "comedian_id": comedian_id,
-        "event_id": event_id
-    })
-    workflow_steps.append({"step": "promotion_setup", "result": promotion})
+    # Availability is reported, not enforced, so the three API calls are independent
+    # and run concurrently
+    availability_check, booking_log, promotion = await asyncio.gather(
+        # Step 1: Check comedian availability (Supabase)
+        _throttled(supabase_comedian_operations("get", comedian_id=comedian_id)),
+        # Step 2: Log booking in Notion
+        _throttled(notion_project_logging("booking_record", "create", {
+            "comedian_id": comedian_id,
+            "event_id": event_id,
+            "stage": workflow_stage
+        })),
+        # Step 3: Create promotion campaign (Metricool)
+        _throttled(metricool_promotion("comedian_spotlight", {
+            "comedian_id": comedian_id,
+            "event_id": event_id
+        }))
+    )
+    workflow_steps = [
+        {"step": "availability_check", "result": availability_check},
+        {"step": "notion_logging", "result": booking_log},
+        {"step": "promotion_setup", "result": promotion}
+    ]
     
     return {
         "workflow": "comedian_booking",
@@ -305,7 +371,7 @@ def comedian_booking_workflow(comedian_id: str, event_id: str, workflow_stage: s
         "stage": workflow_stage,
         "steps": workflow_steps,
         "status": "workflow_executed",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 # ============================================================================
@@ -317,9 +383,16 @@ def main():
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8080"))
     
-    logger.info(f"Starting Stand Up Sydney FastMCP Server")
-    logger.info(f"Server: {host}:{port}")
-    logger.info(f"Enabled tools: {[name for name, config in TOOL_CONFIGS.items() if config['enabled']]}")
+    if not acquire_single_instance_lock():
+        logger.info("Stand Up Sydney FastMCP Server already running (%s is locked), exiting", pid_file_path())
+        sys.exit(0)
+    
+    logger.info("Starting Stand Up Sydney FastMCP Server")
+    logger.info("Server: %s:%s", host, port)
+    logger.info("Enabled tools: %s", list(_ENABLED_TOOLS))
+    
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
     
     # Run the FastMCP server
     app.run(host=host, port=port)
@@ -5,184 +5,159 @@ Fixed version with proper error handling and logging
 """
 
 import os
-import json
+import time
+import types
 import logging
+import functools
+import importlib.util
+import platform
 import sys
-from typing import Dict, Any, List, Optional
-from datetime import datetime
 import asyncio
+from typing import Dict, Any, List, Set, Tuple
 from pathlib import Path
 
+from _clients import build_supabase_query, github_get, github_http_client, supabase_client, supabase_result
+from _runtime import acquire_single_instance_lock, cached, configure_logging, health_response, install_uvloop, now_iso, pid_file_path
+
+APP_DIR = Path("/opt/standup-sydney-mcp")
+
 # Create logs directory if it doesn't exist
-log_dir = Path("/opt/standup-sydney-mcp/logs")
-log_dir.mkdir(exist_ok=True)
+log_dir = APP_DIR / "logs"
+if not log_dir.is_dir():
+    log_dir.mkdir(parents=True, exist_ok=True)
 
-# Configure logging with fallback
+# Load environment variables from .env file if it exists, before anything
+# reads them (LOG_LEVEL below, PID_FILE, and the settings imported further down)
 try:
-    log_file = log_dir / "fastmcp.log"
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(str(log_file)),
-            logging.StreamHandler()
-        ]
-    )
-except PermissionError:
-    # Fallback to stdout only if log file can't be created
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[logging.StreamHandler()]
-    )
+    from dotenv import load_dotenv
+    # load_dotenv skips a missing file itself, and never overrides variables
+    # that are already set
+    _env_loaded = load_dotenv(APP_DIR / ".env")
+except ImportError:
+    _env_loaded = None
+
+# Configure logging, falling back to stdout only if the log file can't be written
+log_file = log_dir / "fastmcp.log"
+configure_logging(str(log_file))
 
 logger = logging.getLogger(__name__)
 
+if _env_loaded is None:
+    logger.warning("python-dotenv not installed, skipping .env file loading")
+elif _env_loaded:
+    logger.info("Loaded environment variables from .env file")
+
 # Try to import FastMCP with error handling
 try:
     from fastmcp import FastMCP
+    from fastmcp.utilities.types import Image
     logger.info("FastMCP imported successfully")
 except ImportError as e:
-    logger.error(f"Failed to import FastMCP: {e}")
+    logger.error("Failed to import FastMCP: %s", e)
     logger.error("Please install fastmcp: pip install fastmcp>=0.3.0")
     sys.exit(1)
 
-# Load environment variables from .env file if it exists
-try:
-    from dotenv import load_dotenv
-    env_file = Path("/opt/standup-sydney-mcp/.env")
-    if env_file.exists():
-        load_dotenv(env_file)
-        logger.info("Loaded environment variables from .env file")
-except ImportError:
-    logger.warning("python-dotenv not installed, skipping .env file loading")
+# Shared configuration, the Postgres settings and the browser settings read
+# the environment, so import them once .env is loaded
+from _browser import PLATFORM_URL, context_pool, new_page, pooled_page, save_storage_state, screenshots, storage_state_file, storage_state_for
+from _db import DB_ENABLED, build_query, database
+from config import (
+    GITHUB_DISABLED, GITHUB_ENABLED, GITHUB_TOKEN, METRICOOL_ENABLED, NOTION_ENABLED,
+    SUPABASE_DISABLED, SUPABASE_ENABLED, SUPABASE_KEY, SUPABASE_URL,
+    enabled_tool_names, make_health_base, make_server_config, make_tool_configs, make_tools_list
+)
 
 # Initialize FastMCP server
 try:
     app = FastMCP("Stand Up Sydney MCP Server")
     logger.info("FastMCP server initialized successfully")
 except Exception as e:
-    logger.error(f"Failed to initialize FastMCP server: {e}")
+    logger.error("Failed to initialize FastMCP server: %s", e)
     sys.exit(1)
 
-# Server configuration
-SERVER_CONFIG = {
-    "name": "Stand Up Sydney FastMCP",
-    "version": "1.1.0",
-    "host": "170.64.129.59",  # Updated IP
-    "port": 8080,
-    "deployed_at": datetime.now().isoformat(),
-    "platform": "comedy_booking_automation"
-}
+# Server configuration (read-only, it is shared by every status response)
+SERVER_CONFIG = make_server_config(version="1.1.0", host="170.64.129.59")  # Updated IP
 
 # Tool configurations for Stand Up Sydney platform
-TOOL_CONFIGS = {
-    "supabase": {
-        "url": os.getenv("SUPABASE_URL", ""),
-        "key": os.getenv("SUPABASE_ANON_KEY", ""),
-        "enabled": bool(os.getenv("SUPABASE_URL")),
-        "description": "Backend API operations for Stand Up Sydney database"
-    },
-    "github": {
-        "token": os.getenv("GITHUB_TOKEN", ""),
-        "enabled": bool(os.getenv("GITHUB_TOKEN")),
-        "description": "Version control and deployment tracking"
-    },
-    "notion": {
-        "token": os.getenv("NOTION_TOKEN", ""),
-        "enabled": bool(os.getenv("NOTION_TOKEN")),
-        "description": "Project logging, tasks, and documentation"
-    },
-    "metricool": {
-        "api_key": os.getenv("METRICOOL_API_KEY", ""),
-        "enabled": bool(os.getenv("METRICOOL_API_KEY")),
-        "description": "Social media promotion and analytics"
-    },
-    "playwright": {
-        "enabled": True,
-        "description": "Playwright browser automation for testing and web scraping"
-    },
-    "filesystem": {
-        "enabled": True,
-        "description": "File operations for content management"
-    }
-}
+TOOL_CONFIGS = make_tool_configs("playwright")
+
+# Views derived from TOOL_CONFIGS, which is fixed once the environment has been read
+_ENABLED_TOOLS = enabled_tool_names("playwright")
+_ENV_STATUS = types.MappingProxyType({
+    "SUPABASE_URL": SUPABASE_ENABLED,
+    "GITHUB_TOKEN": GITHUB_ENABLED,
+    "NOTION_TOKEN": NOTION_ENABLED,
+    "METRICOOL_API_KEY": METRICOOL_ENABLED
+})
+_HEALTH_BASE = make_health_base(
+    "playwright", SERVER_CONFIG, python_version=sys.version, environment_vars=dict(_ENV_STATUS)
+)
+_TOOLS_LIST = make_tools_list("playwright", SERVER_CONFIG)
+
+# Error response for the Postgres tools when no connection string is set
+_DB_DISABLED = types.MappingProxyType({"error": "Postgres pool not enabled - check SUPABASE_DB_URL"})
 
 @app.tool()
-def health_check() -> Dict[str, Any]:
+async def health_check() -> Dict[str, Any]:
     """Health check endpoint for the FastMCP server"""
-    enabled_tools = [name for name, config in TOOL_CONFIGS.items() if config["enabled"]]
-    
-    return {
-        "status": "healthy",
-        "server": SERVER_CONFIG,
-        "tools_enabled": enabled_tools,
-        "tools_count": len(enabled_tools),
-        "timestamp": datetime.now().isoformat(),
-        "deployment": "droplet_170.64.129.59",
-        "python_version": sys.version,
-        "environment_vars": {
-            "SUPABASE_URL": bool(os.getenv("SUPABASE_URL")),
-            "GITHUB_TOKEN": bool(os.getenv("GITHUB_TOKEN")),
-            "NOTION_TOKEN": bool(os.getenv("NOTION_TOKEN")),
-            "METRICOOL_API_KEY": bool(os.getenv("METRICOOL_API_KEY"))
-        }
-    }
+    return health_response(_HEALTH_BASE)
 
 @app.tool()
-def list_tools() -> Dict[str, Any]:
+async def list_tools() -> Dict[str, Any]:
     """List all available MCP tools and their status"""
-    tools_status = {}
-    for name, config in TOOL_CONFIGS.items():
-        tools_status[name] = {
-            "enabled": config["enabled"],
-            "description": config["description"],
-            "configured": bool(config.get("token") or config.get("api_key") or config.get("url") or config["enabled"])
-        }
-    
+    return _TOOLS_LIST
+
+@functools.lru_cache(maxsize=1)
+def _module_status() -> Dict[str, str]:
+    """Check if all required modules are available (fixed for the process lifetime)"""
+    required_modules = ['fastmcp', 'supabase', 'github', 'notion_client', 'dotenv', 'uvicorn']
+    # find_spec locates a module without importing it
+    return {
+        module: "available" if importlib.util.find_spec(module) is not None else "missing"
+        for module in required_modules
+    }
+
+@functools.lru_cache(maxsize=1)
+def _platform_info() -> Dict[str, str]:
     return {
-        "tools": tools_status,
-        "total_tools": len(TOOL_CONFIGS),
-        "enabled_tools": len([c for c in TOOL_CONFIGS.values() if c["enabled"]]),
-        "server_config": SERVER_CONFIG
+        "system": platform.system(),
+        "python_version": platform.python_version(),
+        "architecture": platform.architecture()[0]
     }
 
+def _app_dir_names() -> Set[str]:
+    """Names in the application directory, read with a single scandir"""
+    try:
+        with os.scandir(APP_DIR) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+# Diagnostics don't need to be real-time, so they are rebuilt less often
+DIAGNOSTICS_CACHE_TTL = 30.0
+
 @app.tool()
-def server_diagnostics() -> Dict[str, Any]:
+async def server_diagnostics() -> Dict[str, Any]:
     """Diagnose server configuration and environment"""
-    import platform
-    
-    # Check if all required modules are available
-    module_status = {}
-    required_modules = ['fastmcp', 'supabase', 'github', 'notion_client', 'dotenv', 'uvicorn']
-    
-    for module in required_modules:
-        try:
-            __import__(module)
-            module_status[module] = "available"
-        except ImportError:
-            module_status[module] = "missing"
-    
+    return cached("server_diagnostics", DIAGNOSTICS_CACHE_TTL, _build_diagnostics)
+
+def _build_diagnostics() -> Dict[str, Any]:
     return {
-        "platform_info": {
-            "system": platform.system(),
-            "python_version": platform.python_version(),
-            "architecture": platform.architecture()[0]
-        },
-        "module_status": module_status,
+        "platform_info": _platform_info(),
+        "module_status": _module_status(),
         "environment_variables": {
             "PORT": os.getenv("PORT", "8080"),
             "HOST": os.getenv("HOST", "0.0.0.0"),
-            "SUPABASE_URL_SET": bool(os.getenv("SUPABASE_URL")),
-            "GITHUB_TOKEN_SET": bool(os.getenv("GITHUB_TOKEN"))
+            "SUPABASE_URL_SET": _ENV_STATUS["SUPABASE_URL"],
+            "GITHUB_TOKEN_SET": _ENV_STATUS["GITHUB_TOKEN"]
         },
         "file_system": {
             "working_directory": os.getcwd(),
             "log_directory": str(log_dir),
-            "log_file_exists": log_file.exists() if 'log_file' in locals() else False,
-            "env_file_exists": Path("/opt/standup-sydney-mcp/.env").exists()
+            "log_file_exists": log_file.exists(),
+            "env_file_exists": ".env" in _app_dir_names()
         },
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 # ============================================================================
@@ -190,36 +165,150 @@ def server_diagnostics() -> Dict[str, Any]:
 # ============================================================================
 
 @app.tool()
-def supabase_query(table: str, operation: str = "select", filters: Dict[str, Any] = None, data: Dict[str, Any] = None) -> Dict[str, Any]:
-    """Execute Supabase database operations for Stand Up Sydney platform"""
-    if not TOOL_CONFIGS["supabase"]["enabled"]:
-        return {"error": "Supabase tool not enabled - check SUPABASE_URL and SUPABASE_ANON_KEY"}
+async def supabase_query(table: str, operation: str = "select", filters: Dict[str, Any] = None, data: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Execute Supabase database operations for Stand Up Sydney platform
+    
+    With SUPABASE_DB_URL set the query goes straight to Postgres. Filter and
+    data values are cast to their column types as the REST API does, but
+    dates and timestamps come back in Postgres's text form
+    ("2026-10-15 07:00:00+00") rather than ISO 8601.
+    
+    Args:
+        table: Database table name (comedians, events, bookings, venues, etc.)
+        operation: Operation type (select, insert, update, delete)
+        filters: Query filters for select/update/delete
+        data: Data for insert/update operations
+    """
+    # Either backend will do: Postgres directly, or the REST API
+    if not DB_ENABLED and not SUPABASE_ENABLED:
+        return dict(SUPABASE_DISABLED)
     
-    logger.info(f"Supabase operation: {operation} on {table}")
+    logger.info("Supabase operation: %s on %s", operation, table)
+    
+    try:
+        if DB_ENABLED:
+            # Straight to Postgres over the shared connection pool
+            rows = await database.fetch(*build_query(table, operation, filters, data))
+        else:
+            query = build_supabase_query(supabase_client(SUPABASE_URL, SUPABASE_KEY), table, operation, filters, data)
+            # The Supabase SDK is synchronous, keep it off the event loop
+            rows = (await asyncio.to_thread(query.execute)).data
+    except Exception as e:
+        logger.error("Supabase %s on %s failed: %s", operation, table, e)
+        return {"error": f"Supabase {operation} on {table} failed: {e}"}
+    
+    return supabase_result(table, operation, filters, data, rows)
+
+@app.tool()
+async def supabase_batch(operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run several Supabase operations in one transaction on one connection
+    
+    Args:
+        operations: List of {"table", "operation", "filters", "data"} dicts, as for supabase_query
+    """
+    if not DB_ENABLED:
+        return dict(_DB_DISABLED)
+    
+    logger.info("Supabase batch of %d operations", len(operations))
+    
+    try:
+        results = await database.run_batch(operations)
+    except ValueError as e:
+        return {"error": f"Supabase batch rejected: {e}"}
     
     return {
-        "operation": operation,
-        "table": table,
-        "filters": filters or {},
-        "data": data or {},
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to execute {operation} on {table} table",
-        "timestamp": datetime.now().isoformat()
+        "operations": len(operations),
+        "succeeded": sum(1 for result in results if result["status"] == "success"),
+        "results": results,
+        "timestamp": now_iso()
     }
 
 @app.tool()
-def github_operations(repo: str, action: str = "status") -> Dict[str, Any]:
-    """GitHub operations for Stand Up Sydney"""
-    if not TOOL_CONFIGS["github"]["enabled"]:
-        return {"error": "GitHub tool not enabled - check GITHUB_TOKEN"}
+async def supabase_pool_stats() -> Dict[str, Any]:
+    """Connection pool size, query counters and a fresh health check for the Supabase database"""
+    if not DB_ENABLED:
+        return dict(_DB_DISABLED)
     
-    logger.info(f"GitHub operation: {action} for {repo}")
+    await database.health_check()
+    return database.get_stats()
+
+# GitHub API path read by each github_operations action
+_GITHUB_ACTIONS = types.MappingProxyType({
+    "status": "/repos/{repo}",
+    "commits": "/repos/{repo}/commits",
+    "pulls": "/repos/{repo}/pulls",
+    "issues": "/repos/{repo}/issues",
+    "releases": "/repos/{repo}/releases",
+    "deployments": "/repos/{repo}/deployments"
+})
+
+# Response skeletons copied for each call, only the per-call fields are filled in
+_GITHUB_TEMPLATE = {
+    "repo": None,
+    "action": None,
+    "result": None,
+    "cached": None,
+    "status": "success",
+    "timestamp": None
+}
+
+@app.tool()
+async def github_operations(repo: str, action: str = "status") -> Dict[str, Any]:
+    """
+    GitHub operations for Stand Up Sydney
+    
+    Args:
+        repo: Repository as owner/name
+        action: What to read (status, commits, pulls, issues, releases, deployments)
+    """
+    if not GITHUB_ENABLED:
+        return dict(GITHUB_DISABLED)
+    
+    logger.info("GitHub operation: %s for %s", action, repo)
+    
+    path = _GITHUB_ACTIONS.get(action)
+    if path is None:
+        return {"error": f"Unsupported GitHub action: {action}"}
+    if repo.count("/") != 1:
+        return {"error": f"Repository must be owner/name, got {repo}"}
     
+    try:
+        body, cached = await github_get(github_http_client(GITHUB_TOKEN), path.format(repo=repo))
+    except Exception as e:
+        logger.error("GitHub %s for %s failed: %s", action, repo, e)
+        return {"error": f"GitHub {action} for {repo} failed: {e}"}
+    
+    response = _GITHUB_TEMPLATE.copy()
+    response["repo"] = repo
+    response["action"] = action
+    response["result"] = body
+    response["cached"] = cached
+    response["timestamp"] = now_iso()
+    return response
+
+@app.tool()
+async def github_batch(repos: List[str], action: str = "status") -> Dict[str, Any]:
+    """
+    Run one github_operations action for several repositories at once
+    
+    Args:
+        repos: Repositories as owner/name
+        action: What to read (status, commits, pulls, issues, releases, deployments)
+    """
+    if not GITHUB_ENABLED:
+        return dict(GITHUB_DISABLED)
+    
+    logger.info("GitHub batch: %s for %d repos", action, len(repos))
+    
+    repos = list(dict.fromkeys(repos))
+    # The requests are multiplexed over the client's shared connection
+    results = await asyncio.gather(*(github_operations(repo, action) for repo in repos))
     return {
-        "repo": repo,
         "action": action,
-        "status": "ready_for_implementation",
-        "timestamp": datetime.now().isoformat()
+        "results": dict(zip(repos, results)),
+        "timestamp": now_iso()
     }
 
 # ============================================================================
@@ -227,7 +316,24 @@ def github_operations(repo: str, action: str = "status") -> Dict[str, Any]:
 # ============================================================================
 
 @app.tool()
-def playwright_navigate(url: str, wait_for: str = "load") -> Dict[str, Any]:
+async def playwright_pool_stats() -> Dict[str, Any]:
+    """Warm browser contexts kept for navigation and screenshots, and how many are in use"""
+    return {**context_pool.stats(), "timestamp": now_iso()}
+
+_NAVIGATE_TEMPLATE = {
+    "action": "navigate",
+    "url": None,
+    "wait_for": None,
+    "final_url": None,
+    "http_status": None,
+    "title": None,
+    "status": "success",
+    "message": None,
+    "timestamp": None
+}
+
+@app.tool()
+async def playwright_navigate(url: str, wait_for: str = "load") -> Dict[str, Any]:
     """
     Navigate to a URL using Playwright for testing Stand Up Sydney platform
     
@@ -235,19 +341,41 @@ def playwright_navigate(url: str, wait_for: str = "load") -> Dict[str, Any]:
         url: URL to navigate to (e.g., https://standup-sydney.vercel.app)
         wait_for: What to wait for (load, networkidle, domcontentloaded)
     """
-    logger.info(f"Playwright navigation to {url}")
+    logger.info("Playwright navigation to %s", url)
     
-    return {
-        "action": "navigate",
-        "url": url,
-        "wait_for": wait_for,
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to navigate to {url}",
-        "timestamp": datetime.now().isoformat()
-    }
+    try:
+        async with pooled_page() as page:
+            http_response = await page.goto(url, wait_until=wait_for)
+            title = await page.title()
+            final_url = page.url
+    except Exception as e:
+        logger.error("Playwright navigation to %s failed: %s", url, e)
+        return {"error": f"Playwright navigation to {url} failed: {e}"}
+    
+    response = _NAVIGATE_TEMPLATE.copy()
+    response["url"] = url
+    response["wait_for"] = wait_for
+    response["final_url"] = final_url
+    response["http_status"] = http_response.status if http_response is not None else None
+    response["title"] = title
+    response["message"] = f"FastMCP navigated to {url}"
+    response["timestamp"] = now_iso()
+    return response
+
+_TEST_ELEMENT_TEMPLATE = {
+    "action": "test_element",
+    "selector": None,
+    "test_action": None,
+    "text": None,
+    "url": None,
+    "result": None,
+    "status": "success",
+    "message": None,
+    "timestamp": None
+}
 
 @app.tool()
-def playwright_test_element(selector: str, action: str = "click", text: str = None) -> Dict[str, Any]:
+async def playwright_test_element(selector: str, action: str = "click", text: str = None, url: str = PLATFORM_URL) -> Dict[str, Any]:
     """
     Test UI elements on Stand Up Sydney platform
     
@@ -255,122 +383,511 @@ def playwright_test_element(selector: str, action: str = "click", text: str = No
         selector: CSS selector or text selector
         action: Action to perform (click, type, check, screenshot)
         text: Text to type (for type action)
+        url: Page the element is on
     """
-    logger.info(f"Playwright element test: {action} on {selector}")
+    logger.info("Playwright element test: %s on %s", action, selector)
     
-    return {
-        "action": "test_element",
-        "selector": selector,
-        "test_action": action,
-        "text": text,
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to {action} on {selector}",
-        "timestamp": datetime.now().isoformat()
-    }
+    if action not in ("click", "type", "check", "screenshot"):
+        return {"error": f"Unsupported element action: {action}"}
+    
+    result = None
+    try:
+        async with new_page() as page:
+            await page.goto(url)
+            locator = page.locator(selector).first
+            if action == "click":
+                await locator.click()
+            elif action == "type":
+                await locator.fill(text or "")
+            elif action == "check":
+                await locator.check()
+            else:
+                result = _screenshot_ref(await locator.screenshot(), "png")
+    except Exception as e:
+        logger.error("Playwright %s on %s failed: %s", action, selector, e)
+        return {"error": f"Playwright {action} on {selector} failed: {e}"}
+    
+    response = _TEST_ELEMENT_TEMPLATE.copy()
+    response["selector"] = selector
+    response["test_action"] = action
+    response["text"] = text
+    response["url"] = url
+    response["result"] = result
+    response["message"] = f"FastMCP performed {action} on {selector}"
+    response["timestamp"] = now_iso()
+    return response
+
+_FORM_TEST_TEMPLATE = {
+    "action": "form_test",
+    "form_data": None,
+    "submit_selector": None,
+    "url": None,
+    "final_url": None,
+    "status": "success",
+    "message": None,
+    "timestamp": None
+}
 
 @app.tool()
-def playwright_form_test(form_data: Dict[str, str], submit_selector: str = None) -> Dict[str, Any]:
+async def playwright_form_test(form_data: Dict[str, str], submit_selector: str = None, url: str = PLATFORM_URL) -> Dict[str, Any]:
     """
     Test forms on Stand Up Sydney platform (event creation, comedian signup, etc.)
     
     Args:
         form_data: Dictionary of field selectors and values
         submit_selector: CSS selector for submit button
+        url: Page the form is on
     """
-    logger.info(f"Playwright form test with {len(form_data)} fields")
+    logger.info("Playwright form test with %d fields", len(form_data))
     
-    return {
-        "action": "form_test",
-        "form_data": form_data,
-        "submit_selector": submit_selector,
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to test form with {len(form_data)} fields",
-        "timestamp": datetime.now().isoformat()
-    }
+    try:
+        async with new_page() as page:
+            await page.goto(url)
+            for field_selector, value in form_data.items():
+                await page.fill(field_selector, value)
+            if submit_selector:
+                await page.click(submit_selector)
+                await page.wait_for_load_state()
+            final_url = page.url
+    except Exception as e:
+        logger.error("Playwright form test on %s failed: %s", url, e)
+        return {"error": f"Playwright form test on {url} failed: {e}"}
+    
+    response = _FORM_TEST_TEMPLATE.copy()
+    response["form_data"] = form_data
+    response["submit_selector"] = submit_selector
+    response["url"] = url
+    response["final_url"] = final_url
+    response["message"] = f"FastMCP tested form with {len(form_data)} fields"
+    response["timestamp"] = now_iso()
+    return response
+
+# Playwright screenshot() options for each supported image format
+_SCREENSHOT_OPTIONS = types.MappingProxyType({
+    "png": types.MappingProxyType({"type": "png"}),
+    "jpeg": types.MappingProxyType({"type": "jpeg", "quality": 80})
+})
+
+def _screenshot_ref(image: bytes, image_format: str) -> Dict[str, Any]:
+    """Keep a screenshot for get_screenshot and describe it for a response"""
+    return {"screenshot_ref": screenshots.put(image, image_format), "bytes": len(image), "format": image_format}
+
+_SCREENSHOT_TEMPLATE = {
+    "action": "screenshot",
+    "selector": None,
+    "full_page": None,
+    "url": None,
+    "screenshot_ref": None,
+    "bytes": None,
+    "format": None,
+    "status": "success",
+    "message": "FastMCP took screenshot",
+    "timestamp": None
+}
 
 @app.tool()
-def playwright_screenshot(selector: str = None, full_page: bool = False) -> Dict[str, Any]:
+async def playwright_screenshot(selector: str = None, full_page: bool = False, url: str = PLATFORM_URL, image_format: str = "png") -> Dict[str, Any]:
     """
     Take screenshots for visual testing of Stand Up Sydney platform
     
+    The image is kept server-side; fetch it with get_screenshot(screenshot_ref).
+    
     Args:
         selector: CSS selector to screenshot (if None, screenshots viewport)
         full_page: Whether to capture full page
+        url: Page to screenshot
+        image_format: png, or jpeg for a much smaller image
     """
-    logger.info(f"Playwright screenshot: selector={selector}, full_page={full_page}")
+    logger.info("Playwright screenshot: selector=%s, full_page=%s", selector, full_page)
     
-    return {
-        "action": "screenshot",
-        "selector": selector,
-        "full_page": full_page,
-        "status": "ready_for_implementation",
-        "message": "FastMCP ready to take screenshot",
-        "timestamp": datetime.now().isoformat()
-    }
+    if image_format not in _SCREENSHOT_OPTIONS:
+        return {"error": f"Unsupported screenshot format: {image_format}"}
+    options = _SCREENSHOT_OPTIONS[image_format]
+    
+    try:
+        async with pooled_page() as page:
+            await page.goto(url)
+            if selector:
+                image = await page.locator(selector).first.screenshot(**options)
+            else:
+                image = await page.screenshot(full_page=full_page, **options)
+    except Exception as e:
+        logger.error("Playwright screenshot of %s failed: %s", url, e)
+        return {"error": f"Playwright screenshot of {url} failed: {e}"}
+    
+    response = _SCREENSHOT_TEMPLATE.copy()
+    response["selector"] = selector
+    response["full_page"] = full_page
+    response["url"] = url
+    response.update(_screenshot_ref(image, image_format))
+    response["timestamp"] = now_iso()
+    return response
 
 @app.tool()
-def playwright_performance_test(url: str, metrics: List[str] = None) -> Dict[str, Any]:
+async def get_screenshot(screenshot_ref: str) -> Any:
+    """
+    Fetch an image taken by playwright_screenshot or a screenshot step
+    
+    Args:
+        screenshot_ref: The screenshot_ref from that response
+    """
+    shot = screenshots.get(screenshot_ref)
+    if shot is None:
+        return {"error": f"Screenshot {screenshot_ref} not found, it may have expired"}
+    return Image(data=shot[0], format=shot[1])
+
+_DEFAULT_METRICS = ("load_time", "network_requests", "console_errors")
+
+async def _measured_goto(page, url: str, wait_for: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Navigate page to url, collecting every metric playwright_performance_test can report
+    
+    Counters come from the DevTools protocol: network responses are pushed as
+    events, and Performance.getMetrics returns every Chromium counter (JSHeapUsedSize,
+    Nodes, LayoutCount, ScriptDuration, ...) in a single message.
+    """
+    network_responses = 0
+    console_errors: List[str] = []
+    
+    def on_response(_) -> None:
+        nonlocal network_responses
+        network_responses += 1
+    
+    def on_console(message) -> None:
+        if message.type == "error":
+            console_errors.append(message.text)
+    
+    cdp = await page.context.new_cdp_session(page)
+    try:
+        await cdp.send("Performance.enable")
+        await cdp.send("Network.enable")
+        cdp.on("Network.responseReceived", on_response)
+        page.on("console", on_console)
+        started = time.perf_counter()
+        http_response = await page.goto(url, wait_until=wait_for)
+        load_time_ms = (time.perf_counter() - started) * 1000
+        counters = await cdp.send("Performance.getMetrics")
+    finally:
+        await cdp.detach()
+    
+    collected = {metric["name"]: metric["value"] for metric in counters["metrics"]}
+    collected["load_time"] = round(load_time_ms, 1)
+    collected["network_requests"] = network_responses
+    collected["console_errors"] = console_errors
+    return http_response, collected
+
+_PERFORMANCE_TEMPLATE = {
+    "action": "performance_test",
+    "url": None,
+    "metrics": None,
+    "results": None,
+    "status": "success",
+    "message": None,
+    "timestamp": None
+}
+
+@app.tool()
+async def playwright_performance_test(url: str, metrics: List[str] = None) -> Dict[str, Any]:
     """
     Performance testing for Stand Up Sydney platform
     
     Args:
         url: URL to test
-        metrics: List of metrics to collect (load_time, network_requests, etc.)
+        metrics: List of metrics to collect (load_time, network_requests, console_errors,
+            or any Chromium Performance.getMetrics counter such as JSHeapUsedSize)
     """
     if metrics is None:
-        metrics = ["load_time", "network_requests", "console_errors"]
+        metrics = list(_DEFAULT_METRICS)
     
-    logger.info(f"Playwright performance test for {url}")
+    logger.info("Playwright performance test for %s", url)
     
-    return {
-        "action": "performance_test",
-        "url": url,
-        "metrics": metrics,
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to test performance of {url}",
-        "timestamp": datetime.now().isoformat()
-    }
+    try:
+        async with new_page() as page:
+            _, collected = await _measured_goto(page, url, "load")
+    except Exception as e:
+        logger.error("Playwright performance test for %s failed: %s", url, e)
+        return {"error": f"Playwright performance test for {url} failed: {e}"}
+    
+    response = _PERFORMANCE_TEMPLATE.copy()
+    response["url"] = url
+    response["metrics"] = metrics
+    response["results"] = {name: collected[name] for name in metrics if name in collected}
+    response["message"] = f"FastMCP tested performance of {url}"
+    response["timestamp"] = now_iso()
+    return response
+
+_CAPTURE_TEMPLATE = {
+    "action": "capture",
+    "url": None,
+    "wait_for": None,
+    "final_url": None,
+    "http_status": None,
+    "title": None,
+    "screenshot_ref": None,
+    "bytes": None,
+    "format": None,
+    "performance": None,
+    "status": "success",
+    "message": None,
+    "timestamp": None
+}
+
+@app.tool()
+async def playwright_capture(url: str, screenshot: bool = True, performance: bool = True, wait_for: str = "load", full_page: bool = False, image_format: str = "png") -> Dict[str, Any]:
+    """
+    Navigate, screenshot and measure performance of a page in one visit
+    
+    Does the work of playwright_navigate, playwright_screenshot and
+    playwright_performance_test with a single context and navigation.
+    
+    Args:
+        url: URL to capture
+        screenshot: Whether to take a screenshot (fetch it with get_screenshot)
+        performance: Whether to collect load metrics and Chromium performance counters
+        wait_for: What to wait for (load, networkidle, domcontentloaded)
+        full_page: Whether to capture full page
+        image_format: png, or jpeg for a much smaller image
+    """
+    logger.info("Playwright capture of %s: screenshot=%s, performance=%s", url, screenshot, performance)
+    
+    if image_format not in _SCREENSHOT_OPTIONS:
+        return {"error": f"Unsupported screenshot format: {image_format}"}
+    
+    collected = None
+    image = None
+    try:
+        # Performance is measured in a fresh context so a warm cache can't flatter it
+        async with (new_page() if performance else pooled_page()) as page:
+            if performance:
+                http_response, collected = await _measured_goto(page, url, wait_for)
+            else:
+                http_response = await page.goto(url, wait_until=wait_for)
+            title = await page.title()
+            final_url = page.url
+            if screenshot:
+                image = await page.screenshot(full_page=full_page, **_SCREENSHOT_OPTIONS[image_format])
+    except Exception as e:
+        logger.error("Playwright capture of %s failed: %s", url, e)
+        return {"error": f"Playwright capture of {url} failed: {e}"}
+    
+    response = _CAPTURE_TEMPLATE.copy()
+    response["url"] = url
+    response["wait_for"] = wait_for
+    response["final_url"] = final_url
+    response["http_status"] = http_response.status if http_response is not None else None
+    response["title"] = title
+    if image is not None:
+        response.update(_screenshot_ref(image, image_format))
+    response["performance"] = collected
+    response["message"] = f"FastMCP captured {url}"
+    response["timestamp"] = now_iso()
+    return response
+
+# Steps that only read the page, so consecutive ones can run concurrently
+_READ_ONLY_STEPS = frozenset({"assert_visible", "assert_text", "get_text", "screenshot"})
+
+def _step_groups(steps: List[Dict[str, Any]]) -> List[List[int]]:
+    """Step indexes in run order; consecutive read-only steps share a group"""
+    groups: List[List[int]] = []
+    for index, step in enumerate(steps):
+        if groups and step.get("action") in _READ_ONLY_STEPS and steps[groups[-1][-1]].get("action") in _READ_ONLY_STEPS:
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+    return groups
+
+def _step_locator(page, step: Dict[str, Any], locators: Dict[str, Any]):
+    """The locator for a step's selector, built once per page document unless the step sets no_cache"""
+    selector = step.get("selector")
+    if step.get("no_cache"):
+        return page.locator(selector).first
+    locator = locators.get(selector)
+    if locator is None:
+        locator = locators[selector] = page.locator(selector).first
+    return locator
+
+async def _run_step(page, step: Dict[str, Any], locators: Dict[str, Any]) -> Dict[str, Any]:
+    action = step.get("action")
+    selector = step.get("selector")
+    result: Dict[str, Any] = {"action": action, "selector": selector, "status": "passed"}
+    try:
+        if action == "navigate":
+            await page.goto(step.get("url", PLATFORM_URL))
+        elif action == "click":
+            await _step_locator(page, step, locators).click()
+        elif action == "type":
+            await _step_locator(page, step, locators).fill(step.get("text", ""))
+        elif action == "check":
+            await _step_locator(page, step, locators).check()
+        elif action == "wait_for":
+            await _step_locator(page, step, locators).wait_for()
+        elif action == "assert_visible":
+            if not await _step_locator(page, step, locators).is_visible():
+                raise AssertionError(f"{selector} is not visible")
+        elif action in ("assert_text", "get_text"):
+            text = await _step_locator(page, step, locators).inner_text()
+            if action == "assert_text" and step.get("text", "") not in text:
+                raise AssertionError(f"{selector} does not contain {step.get('text', '')!r}")
+            result["text"] = text
+        elif action == "screenshot":
+            image = await (_step_locator(page, step, locators).screenshot() if selector else page.screenshot())
+            result.update(_screenshot_ref(image, "png"))
+        else:
+            raise ValueError(f"Unsupported step action: {action}")
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    return result
+
+async def _run_steps(page, steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run steps on page, stopping at the first failing group; later steps are reported as skipped"""
+    results: List[Dict[str, Any]] = [{"action": step.get("action"), "status": "skipped"} for step in steps]
+    
+    # Scenarios hit the same few selectors step after step; a new document
+    # starts the cache over
+    locators: Dict[str, Any] = {}
+    def on_navigated(frame) -> None:
+        if frame.parent_frame is None:
+            locators.clear()
+    page.on("framenavigated", on_navigated)
+    
+    try:
+        for group in _step_groups(steps):
+            # Steps that change the page run one at a time, read-only
+            # checks against the same page run together
+            group_results = await asyncio.gather(*(_run_step(page, steps[i], locators) for i in group))
+            for i, result in zip(group, group_results):
+                results[i] = result
+            if any(result["status"] == "failed" for result in group_results):
+                break
+    finally:
+        page.remove_listener("framenavigated", on_navigated)
+    return results
+
+_INTEGRATION_TEMPLATE = {
+    "action": "integration_test",
+    "test_scenario": None,
+    "role": None,
+    "steps": None,
+    "total_steps": None,
+    "passed_steps": None,
+    "status": None,
+    "message": None,
+    "timestamp": None
+}
 
 @app.tool()
-def playwright_integration_test(test_scenario: str, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+async def playwright_integration_test(test_scenario: str, steps: List[Dict[str, Any]], role: str = None) -> Dict[str, Any]:
     """
     Full integration testing scenarios for Stand Up Sydney platform
     
     Args:
         test_scenario: Name of the test scenario (e.g., "comedian_booking_flow")
         steps: List of test steps with actions and selectors
+            (navigate, click, type, check, wait_for, assert_visible, assert_text, get_text, screenshot);
+            set no_cache on a step whose selector should be looked up afresh
+        role: Start signed in as admin, comedian or venue, using the state saved by
+            playwright_save_login; leave unset to test as a fresh, signed-out user
+    """
+    logger.info("Playwright integration test: %s with %d steps", test_scenario, len(steps))
+    
+    context_options: Dict[str, Any] = {}
+    if role is not None:
+        try:
+            storage_state = storage_state_for(role)
+        except ValueError as e:
+            return {"error": str(e)}
+        if storage_state is None:
+            return {"error": f"No signed-in state for {role}, run playwright_save_login first"}
+        context_options["storage_state"] = storage_state
+    
+    try:
+        async with new_page(**context_options) as page:
+            results = await _run_steps(page, steps)
+    except Exception as e:
+        logger.error("Playwright integration test %s failed: %s", test_scenario, e)
+        return {"error": f"Playwright integration test {test_scenario} failed: {e}"}
+    
+    passed = sum(1 for result in results if result["status"] == "passed")
+    response = _INTEGRATION_TEMPLATE.copy()
+    response["test_scenario"] = test_scenario
+    response["role"] = role
+    response["steps"] = results
+    response["total_steps"] = len(steps)
+    response["passed_steps"] = passed
+    response["status"] = "passed" if passed == len(steps) else "failed"
+    response["message"] = f"FastMCP ran {test_scenario} integration test"
+    response["timestamp"] = now_iso()
+    return response
+
+@app.tool()
+async def playwright_save_login(role: str, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    logger.info(f"Playwright integration test: {test_scenario} with {len(steps)} steps")
+    Sign in once as a platform role and save the browser state for later integration tests
+    
+    The saved state is used by playwright_integration_test(role=...) for 24 hours.
+    
+    Args:
+        role: Role to sign in as (admin, comedian, venue)
+        steps: Login steps, in the same format as playwright_integration_test
+    """
+    logger.info("Playwright login as %s with %d steps", role, len(steps))
+    
+    try:
+        storage_state_file(role)
+    except ValueError as e:
+        return {"error": str(e)}
+    
+    try:
+        async with new_page() as page:
+            results = await _run_steps(page, steps)
+            signed_in = all(result["status"] == "passed" for result in results)
+            if signed_in:
+                save_storage_state(role, await page.context.storage_state())
+    except Exception as e:
+        logger.error("Playwright login as %s failed: %s", role, e)
+        return {"error": f"Playwright login as {role} failed: {e}"}
     
     return {
-        "action": "integration_test",
-        "test_scenario": test_scenario,
-        "steps": steps,
-        "total_steps": len(steps),
-        "status": "ready_for_implementation",
-        "message": f"FastMCP ready to run {test_scenario} integration test",
-        "timestamp": datetime.now().isoformat()
+        "action": "save_login",
+        "role": role,
+        "steps": results,
+        "status": "saved" if signed_in else "failed",
+        "timestamp": now_iso()
     }
 
 def main():
     """Start the FastMCP server with correct API"""
+    if not acquire_single_instance_lock():
+        logger.info("Stand Up Sydney FastMCP Server already running (%s is locked), exiting", pid_file_path())
+        sys.exit(0)
+    
     try:
-        logger.info(f"Starting Stand Up Sydney FastMCP Server")
-        logger.info(f"Working directory: {os.getcwd()}")
-        logger.info(f"Python version: {sys.version}")
+        logger.info("Starting Stand Up Sydney FastMCP Server")
+        logger.info("Working directory: %s", os.getcwd())
+        logger.info("Python version: %s", sys.version)
+        
+        logger.info("Enabled tools: %s", list(_ENABLED_TOOLS))
         
-        enabled_tools = [name for name, config in TOOL_CONFIGS.items() if config['enabled']]
-        logger.info(f"Enabled tools: {enabled_tools}")
+        if install_uvloop():
+            logger.info("Using uvloop event loop")
         
-        # Run FastMCP server with stdio transport (correct API)
-        logger.info("Starting FastMCP server with stdio transport...")
-        app.run()
+        # stdio by default (correct API), or sse/http to serve many clients over TCP
+        transport = os.getenv("MCP_TRANSPORT", "stdio")
+        if transport == "stdio":
+            logger.info("Starting FastMCP server with stdio transport...")
+            app.run()
+        else:
+            host = os.getenv("HOST", "0.0.0.0")
+            port = int(os.getenv("PORT", "8080"))
+            logger.info("Starting FastMCP server with %s transport on %s:%d...", transport, host, port)
+            app.run(transport=transport, host=host, port=port)
         
     except Exception as e:
-        logger.error(f"Failed to start server: {e}")
-        logger.error(f"Error type: {type(e).__name__}")
+        logger.error("Failed to start server: %s", e)
+        logger.error("Error type: %s", type(e).__name__)
         import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Traceback: %s", traceback.format_exc())
         sys.exit(1)
 
 if __name__ == "__main__":